@@ -8,7 +8,7 @@ Usage:
 
 import sys
 import argparse
-from netpharm import NetworkPharmacology, __version__
+from netpharm import __version__
 from netpharm.utils.config_handler import get_config
 
 
@@ -57,7 +57,8 @@ For documentation, visit: https://github.com/axp-knickei/netpharmpy
         cid = compound_config.get('cid')
         smiles = compound_config.get('smiles')
         
-        # Initialize pipeline
+        # Initialize pipeline (imported here so --help and config errors stay fast)
+        from netpharm import NetworkPharmacology
         npharma = NetworkPharmacology(
             cid=cid,
             smiles=smiles,
@@ -7,6 +7,13 @@ __version__ = "0.1.2"
 __author__ = "Alex Prima"
 __license__ = "MIT"
 
-from .core import NetworkPharmacology
-
 __all__ = ['NetworkPharmacology']
+
+
+def __getattr__(name):
+    # Import the pipeline lazily so that lightweight submodules
+    # (e.g. netpharm.utils) do not pull in pandas, networkx and matplotlib
+    if name == 'NetworkPharmacology':
+        from .core import NetworkPharmacology
+        return NetworkPharmacology
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,10 +2,76 @@
 Compound information retrieval from PubChem.
 """
 
+import functools
+
 import pubchempy as pcp
 import pandas as pd
-from .utils.validators import validate_cid, validate_smiles
-from .utils.api_wrappers import query_pubchem
+from .utils.validators import validate_cid, validate_cids, validate_smiles
+from .utils.api_wrappers import (
+    _disk_cache,
+    query_pubchem,
+    query_pubchem_many,
+    query_pubchem_smiles_many,
+)
+
+
+def _compound_data(compound):
+    """Map a PubChemPy Compound to the compound_data keys."""
+    # Compatible with all PubChemPy versions
+    def get_smiles_property(preferred, fallback):
+        """Get SMILES with fallback for different PubChemPy versions."""
+        for attr in [preferred, fallback]:
+            if hasattr(compound, attr):
+                return getattr(compound, attr)
+        return 'N/A'
+    
+    return {
+        'cid': compound.cid,
+        'canonical_smiles': get_smiles_property('connectivity_smiles', 'canonical_smiles'),
+        'isomeric_smiles': get_smiles_property('smiles', 'isomeric_smiles'),
+        'molecular_formula': compound.molecular_formula,
+        'molecular_weight': compound.molecular_weight,
+        'iupac_name': compound.iupac_name if hasattr(compound, 'iupac_name') else 'N/A'
+    }
+
+
+# PubChem lookups are memoized in-process (lru_cache) and across runs on
+# disk (_disk_cache, same store and expiry as the other API responses).
+# Call .cache_clear() on either helper to drop the in-process entries.
+@functools.lru_cache(maxsize=256)
+@_disk_cache("compound")
+def _compound_from_cid(cid):
+    """compound_data dict for a validated CID."""
+    return _compound_data(pcp.Compound.from_cid(cid))
+
+
+@functools.lru_cache(maxsize=256)
+@_disk_cache("compound")
+def _compound_from_smiles(smiles):
+    """compound_data dict for the first PubChem match of a validated SMILES."""
+    compounds = pcp.get_compounds(smiles, 'smiles')
+    if not compounds:
+        raise ValueError("No compound found for given SMILES")
+    return _compound_data(compounds[0])
+
+
+def _compound_record(result):
+    """
+    Map a PUG-REST property dict to the compound_data keys.
+    
+    Mirrors _compound_data(): ConnectivitySMILES/SMILES are PubChem's
+    current names for CanonicalSMILES/IsomericSMILES, the weight is a
+    float and missing properties are None.
+    """
+    weight = result.get('MolecularWeight')
+    return {
+        'cid': result['CID'],
+        'canonical_smiles': result.get('ConnectivitySMILES', result.get('CanonicalSMILES')),
+        'isomeric_smiles': result.get('SMILES', result.get('IsomericSMILES')),
+        'molecular_formula': result.get('MolecularFormula'),
+        'molecular_weight': float(weight) if weight is not None else None,
+        'iupac_name': result.get('IUPACName')
+    }
 
 
 class CompoundRetriever:
@@ -40,35 +106,16 @@ class CompoundRetriever:
             if cid:
                 cid = validate_cid(cid)
                 self.logger.info(f"Querying PubChem CID: {cid}")
-                compound = pcp.Compound.from_cid(cid)
+                compound_data = _compound_from_cid(cid)
             elif smiles:
                 smiles = validate_smiles(smiles)
                 self.logger.info(f"Querying PubChem SMILES: {smiles}")
-                compounds = pcp.get_compounds(smiles, 'smiles')
-                if not compounds:
-                    raise ValueError("No compound found for given SMILES")
-                compound = compounds[0]
+                compound_data = _compound_from_smiles(smiles)
             else:
                 raise ValueError("Either CID or SMILES must be provided")
             
-            # Extract compound data
-            # Extract compound data (compatible with all PubChemPy versions)
-            def get_smiles_property(compound, preferred, fallback):
-                """Get SMILES with fallback for different PubChemPy versions."""
-                for attr in [preferred, fallback]:
-                    if hasattr(compound, attr):
-                        return getattr(compound, attr)
-                return 'N/A'
-
-            self.compound_data = {
-                'cid': compound.cid,
-                'canonical_smiles': get_smiles_property(compound, 'connectivity_smiles', 'canonical_smiles'),
-                'isomeric_smiles': get_smiles_property(compound, 'smiles', 'isomeric_smiles'),
-                'molecular_formula': compound.molecular_formula,
-                'molecular_weight': compound.molecular_weight,
-                'iupac_name': compound.iupac_name if hasattr(compound, 'iupac_name') else 'N/A'
-            }
-
+            # Copy: the memoized dict is shared between lookups
+            self.compound_data = dict(compound_data)
             
             self.logger.info("\n✓ Compound information retrieved successfully!")
             self.logger.info(f"  CID: {self.compound_data['cid']}")
@@ -86,6 +133,67 @@ class CompoundRetriever:
             self.logger.error("   - Check SMILES format")
             raise SystemExit(1)
     
+    def get_compound_info_many(self, cids):
+        """
+        Retrieve compound information for many CIDs with batched PubChem requests.
+        
+        Args:
+            cids: Iterable of PubChem Compound IDs
+        
+        Returns:
+            dict: Compound information (same keys as get_compound_info) keyed
+                by CID; CIDs not found in PubChem are omitted
+        """
+        try:
+            cids = validate_cids(cids).tolist()
+            self.logger.info(f"Querying PubChem for {len(cids)} CIDs")
+            results = query_pubchem_many(cids)
+        except Exception as e:
+            self.logger.error(f"\n❌ ERROR: Failed to retrieve compound information")
+            self.logger.error(f"   Reason: {str(e)}")
+            raise SystemExit(1)
+        
+        compounds = {cid: _compound_record(result) for cid, result in results.items()}
+        
+        missing = len(set(cids)) - len(compounds)
+        if missing:
+            self.logger.warning(f"⚠ {missing} CID(s) not found in PubChem")
+        self.logger.info(f"✓ Retrieved information for {len(compounds)} compounds")
+        
+        return compounds
+    
+    def get_compound_info_smiles_many(self, smiles_list):
+        """
+        Retrieve compound information for many SMILES with concurrent requests.
+        
+        Args:
+            smiles_list: Iterable of SMILES strings
+        
+        Returns:
+            dict: Compound information (same keys as get_compound_info) keyed
+                by SMILES; invalid SMILES and SMILES that could not be
+                resolved are skipped with a warning
+        """
+        valid = []
+        for smiles in smiles_list:
+            try:
+                valid.append(validate_smiles(smiles))
+            except ValueError as e:
+                self.logger.warning(f"⚠ Skipping invalid SMILES {smiles!r}: {e}")
+        smiles_list = list(dict.fromkeys(valid))
+        self.logger.info(f"Querying PubChem for {len(smiles_list)} SMILES")
+        
+        compounds = {}
+        for smiles, future in zip(smiles_list, query_pubchem_smiles_many(smiles_list)):
+            try:
+                compounds[smiles] = _compound_record(future.result())
+            except Exception as e:
+                self.logger.warning(f"⚠ No PubChem compound for SMILES {smiles}: {e}")
+        
+        self.logger.info(f"✓ Retrieved information for {len(compounds)} compounds")
+        
+        return compounds
+    
     def save_compound_info(self, output_path):
         """
         Save compound information to CSV.
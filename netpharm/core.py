@@ -3,6 +3,7 @@ Main NetworkPharmacology class that orchestrates the entire pipeline.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from .compound import CompoundRetriever
 from .targets import TargetPredictor
@@ -186,21 +187,23 @@ class NetworkPharmacology:
 
             hub_nodes = (
                 metrics
-                .sort_values("Degree", ascending=False)
-                .head(TOP_N)["Protein"]
+                .nlargest(TOP_N, "Degree")["Protein"]
                 .tolist()
             )
             
-            # Save results
-            self.network_analyzer.save_results(step_dir)
-            
-            # Create visualizations
-            self.visualizer.create_all_visualizations(
-                G=self.network,
-                hub_nodes=hub_nodes,
-                top_n=15,
-                label_connectors=False,
-            )
+            # Save results in the background while the plot renders;
+            # the PNG stays on this thread since pyplot is not thread-safe
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                saving = executor.submit(self.network_analyzer.save_results, step_dir)
+                
+                # Create visualizations
+                self.visualizer.create_all_visualizations(
+                    G=self.network,
+                    hub_nodes=hub_nodes,
+                    top_n=15,
+                    label_connectors=False,
+                )
+                saving.result()
 
             return self.network
     
@@ -8,7 +8,9 @@ import time
 from .utils.api_wrappers import (
     PathwayProteinFetchError,
     query_reactome,
+    query_reactome_many,
     get_pathway_proteins,
+    get_pathway_proteins_batch,
 )
 from .utils.validators import validate_pathway_id
 
@@ -44,6 +46,11 @@ class PathwayAnalyzer:
         
         all_pathways = []
         
+        # Issue the first attempt of every keyword search concurrently;
+        # retries below fall back to sequential queries
+        keyword_terms = [t.strip() for t in search_terms if not t.strip().startswith('R-')]
+        pending = dict(zip(keyword_terms, query_reactome_many(keyword_terms)))
+        
         for term in search_terms:
             term = term.strip()
             self.logger.info(f"\nSearching for: '{term}'")
@@ -70,7 +77,10 @@ class PathwayAnalyzer:
                     
                     for attempt in range(max_retries):
                         try:
-                            results = query_reactome(term)
+                            if term in pending:
+                                results = pending.pop(term).result()
+                            else:
+                                results = query_reactome(term)
                             
                             if results:
                                 self.logger.info(f"  Found {len(results)} pathways")
@@ -105,7 +115,7 @@ class PathwayAnalyzer:
                                 
                         except KeyError as e:
                             self.logger.error(f"    API response missing expected field: {str(e)}")
-                            self.logger.debug(f"    Response structure: {results[0] if results else 'empty'}")
+                            self.logger.debug("    Response structure: %s", results[0] if results else 'empty')
                             break  # Don't retry on data format issues
                             
                         except Exception as e:
@@ -156,6 +166,9 @@ class PathwayAnalyzer:
         
         all_proteins = []
         
+        # Fetch every pathway concurrently on the first attempt
+        pending = get_pathway_proteins_batch([p['pathway_id'] for p in self.pathways])
+        
         for pathway in self.pathways:
             pathway_id = pathway['pathway_id']
             pathway_name = pathway['pathway_name']
@@ -168,7 +181,10 @@ class PathwayAnalyzer:
             
             for attempt in range(max_retries):
                 try:
-                    proteins = get_pathway_proteins(pathway_id)
+                    if pathway_id in pending:
+                        proteins = pending.pop(pathway_id).result()
+                    else:
+                        proteins = get_pathway_proteins(pathway_id)
                     
                     if proteins:
                         for protein in proteins:
@@ -238,10 +254,12 @@ class PathwayAnalyzer:
         self.logger.info("\nFinding overlapping targets...")
         
         # Normalize gene names
-        target_genes_upper = set([g.upper() for g in target_genes if g and isinstance(g, str)])
-        pathway_genes_upper = set(self.pathway_proteins['gene_name'].str.upper())
+        target_genes_upper = {g.upper() for g in target_genes if g and isinstance(g, str)}
+        pathway_genes_upper = self.pathway_proteins['gene_name'].str.upper()
         
-        overlapping_genes = target_genes_upper.intersection(pathway_genes_upper)
+        # One hashed membership pass over the pathway table
+        is_overlapping = pathway_genes_upper.isin(target_genes_upper).to_numpy()
+        overlapping_genes = set(pathway_genes_upper[is_overlapping])
         
         if not overlapping_genes:
             self.logger.error("\n❌ ERROR: No overlapping targets found")
@@ -253,15 +271,13 @@ class PathwayAnalyzer:
             raise SystemExit(1)
         
         # Filter pathway proteins to overlapping ones
-        self.overlapping_targets = self.pathway_proteins[
-            self.pathway_proteins['gene_name'].str.upper().isin(overlapping_genes)
-        ]
+        self.overlapping_targets = self.pathway_proteins[is_overlapping]
         
         self.logger.info("\n" + "="*70)
         self.logger.info("PATHWAY OVERLAP SUMMARY:")
         self.logger.info("="*70)
         self.logger.info(f"Predicted targets: {len(target_genes)}")
-        self.logger.info(f"Pathway proteins: {len(pathway_genes_upper)}")
+        self.logger.info(f"Pathway proteins: {pathway_genes_upper.nunique(dropna=False)}")
         self.logger.info(f"🎯 Overlapping targets: {len(overlapping_genes)}")
         self.logger.info("\nOverlapping genes:")
         for gene in sorted(overlapping_genes):
@@ -2,8 +2,60 @@
 Target prediction handling (manual workflow).
 """
 
-import pandas as pd
 import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+
+# Column names used by SwissTargetPrediction exports, in order of preference
+SWISS_PROBABILITY_COLUMNS = ('Probability', 'Probability*', 'Probability (%)')
+
+# Text columns of the downloaded exports, read as strings without type inference
+SWISS_DTYPES = {col: str for col in ('Target', 'Common name', 'Uniprot ID', 'ChEMBL ID', 'Target Class')}
+SUPERPRED_DTYPES = {col: str for col in ('Target Name', 'ChEMBL-ID', 'UniProt ID')}
+
+# Categories of the SuperPred 'Source' column
+SUPERPRED_SOURCES = ['Known', 'Predicted']
+
+
+def _scan_files(directory):
+    """Map file names in ``directory`` to their paths with a single directory read."""
+    with os.scandir(directory) as entries:
+        return {entry.name: entry.path for entry in entries if entry.is_file()}
+
+
+def _read_csv(path, dtype=None):
+    """
+    Read a downloaded CSV, using PyArrow's multithreaded parser when available.
+    
+    Falls back to the default pandas parser if PyArrow is not installed or
+    rejects the file.
+    
+    Args:
+        path: CSV file path
+        dtype: Optional column -> dtype mapping; columns absent from the file are ignored
+    
+    Returns:
+        pd.DataFrame: Parsed table
+    """
+    import pandas as pd
+    
+    try:
+        return pd.read_csv(path, dtype=dtype, engine='pyarrow')
+    except (ImportError, ValueError):
+        return pd.read_csv(path, dtype=dtype, low_memory=False)
+
+
+def _source_column(source, length):
+    """Build a categorical 'Source' column filled with a single SuperPred source."""
+    import numpy as np
+    import pandas as pd
+    
+    code = SUPERPRED_SOURCES.index(source)
+    return pd.Categorical.from_codes(
+        np.full(length, code, dtype=np.int8),
+        categories=SUPERPRED_SOURCES
+    )
 
 
 class TargetPredictor:
@@ -17,12 +69,50 @@ class TargetPredictor:
             logger: Logger instance
         """
         self.logger = logger
+        self._gene_index_cache = None
         self.swiss_targets = None
         self.superpred_targets = None
         self.all_targets = None
     
+    @property
+    def swiss_targets(self):
+        """SwissTargetPrediction results (pd.DataFrame or None)."""
+        return self._swiss_targets
+    
+    @swiss_targets.setter
+    def swiss_targets(self, value):
+        self._swiss_targets = value
+        self._gene_index_cache = None
+    
+    @property
+    def superpred_targets(self):
+        """SuperPred results (pd.DataFrame or None)."""
+        return self._superpred_targets
+    
+    @superpred_targets.setter
+    def superpred_targets(self, value):
+        self._superpred_targets = value
+        self._gene_index_cache = None
+    
+    def _wait_for_files(self, paths, prompt, interactive):
+        """
+        Block on ENTER until the user has downloaded result files.
+        
+        In non-interactive mode the prompt is skipped if any of the files
+        is already present (e.g. on a re-run with cached downloads).
+        
+        Args:
+            paths: Expected file paths
+            prompt: Message shown by input()
+            interactive: Whether to always prompt
+        """
+        if not interactive and any(os.path.exists(p) for p in paths):
+            self.logger.info("\n⏩ Found existing downloads, skipping prompt (non-interactive mode)")
+            return
+        input(prompt)
+    
     def predict_targets_manual(self, smiles, swiss_threshold=0.0, superpred_threshold=0.5, 
-                               output_dir="./data"):
+                               output_dir="./data", interactive=None):
         """
         Guide user through manual target prediction.
         
@@ -31,10 +121,20 @@ class TargetPredictor:
             swiss_threshold: SwissTargetPrediction probability threshold
             superpred_threshold: SuperPred probability threshold
             output_dir: Directory for downloaded files
+            interactive: Prompt even if files already exist. Defaults to True
+                unless the NETPHARM_NONINTERACTIVE environment variable is set.
         
         Returns:
             dict: Target prediction statistics
         """
+        # pandas/numpy are imported here rather than at module level to keep
+        # `import netpharm.targets` cheap
+        import numpy as np
+        import pandas as pd
+        
+        if interactive is None:
+            interactive = not os.environ.get('NETPHARM_NONINTERACTIVE')
+        
         self.logger.info("\n" + "="*70)
         self.logger.info("[STEP 2] TARGET PREDICTION (MANUAL WORKFLOW)")
         self.logger.info("="*70)
@@ -52,24 +152,26 @@ class TargetPredictor:
         self.logger.info("6. Click 'Download' button")
         self.logger.info(f"7. Save as: {output_dir}/swiss_results.csv")
         
-        input("\n⏸ Press ENTER after downloading SwissTargetPrediction results...")
+        self._wait_for_files(
+            [os.path.join(output_dir, "swiss_results.csv")],
+            "\n⏸ Press ENTER after downloading SwissTargetPrediction results...",
+            interactive
+        )
         
         # Load SwissTargetPrediction results
-        swiss_file = os.path.join(output_dir, "swiss_results.csv")
-        if not os.path.exists(swiss_file):
-            self.logger.error(f"\n❌ ERROR: File not found: {swiss_file}")
+        files = _scan_files(output_dir)
+        swiss_file = files.get("swiss_results.csv")
+        if swiss_file is None:
+            self.logger.error(f"\n❌ ERROR: File not found: {os.path.join(output_dir, 'swiss_results.csv')}")
             self.logger.error("   Please download the results and try again.")
             raise SystemExit(1)
         
         try:
-            self.swiss_targets = pd.read_csv(swiss_file)
+            self.swiss_targets = _read_csv(swiss_file, dtype=SWISS_DTYPES)
             
             # Handle column name variations
-            prob_col = None
-            for col in ['Probability', 'Probability*', 'Probability (%)']:
-                if col in self.swiss_targets.columns:
-                    prob_col = col
-                    break
+            found = set(SWISS_PROBABILITY_COLUMNS).intersection(self.swiss_targets.columns)
+            prob_col = next((col for col in SWISS_PROBABILITY_COLUMNS if col in found), None)
             
             if prob_col is None:
                 self.logger.error(f"\n❌ ERROR: Could not find probability column")
@@ -88,11 +190,18 @@ class TargetPredictor:
             if 'Common name' in self.swiss_targets.columns:
                 self.logger.info("   Processing 'Common name' column for gene symbols...")
                 # Split entries like "IKBKG IKBKB CHUK" into lists
-                self.swiss_targets['gene_list'] = self.swiss_targets['Common name'].astype(str).str.split()
-                # Explode the lists so each gene gets its own row
-                self.swiss_targets = self.swiss_targets.explode('gene_list')
+                gene_lists = self.swiss_targets['Common name'].astype(str).str.split()
+                # Rows without any gene keep a single NaN target, as explode() would
+                gene_lists = [genes if isinstance(genes, list) and genes else [np.nan]
+                              for genes in gene_lists]
+                counts = np.fromiter(map(len, gene_lists), dtype=np.intp, count=len(gene_lists))
+                # Repeat each row once per gene so each gene gets its own row
+                rows = np.repeat(np.arange(len(counts)), counts)
+                swiss_targets = self.swiss_targets.iloc[rows].reset_index(drop=True)
+                swiss_targets['gene_list'] = list(chain.from_iterable(gene_lists))
                 # Use this new column as the primary 'Target'
-                self.swiss_targets['Target'] = self.swiss_targets['gene_list']
+                swiss_targets['Target'] = swiss_targets['gene_list']
+                self.swiss_targets = swiss_targets
             
             self.logger.info(f"\n✓ SwissTargetPrediction: {len(self.swiss_targets)} targets loaded")
             self.logger.info(f"   (filtered by probability > {swiss_threshold})")
@@ -112,20 +221,32 @@ class TargetPredictor:
         self.logger.info("5. Download 'Targets.csv' (Known) and 'Targets (1).csv' (Predicted)")
         self.logger.info(f"   Save to: {output_dir}/")
         
-        input("\n⏸ Press ENTER after downloading BOTH SuperPred CSV files...")
+        self._wait_for_files(
+            [os.path.join(output_dir, "Targets.csv"), os.path.join(output_dir, "Targets (1).csv")],
+            "\n⏸ Press ENTER after downloading BOTH SuperPred CSV files...",
+            interactive
+        )
         
         # Load and merge SuperPred results
-        superpred_known_file = os.path.join(output_dir, "Targets.csv")
-        superpred_pred_file = os.path.join(output_dir, "Targets (1).csv")
+        files = _scan_files(output_dir)
+        superpred_known_file = files.get("Targets.csv")
+        superpred_pred_file = files.get("Targets (1).csv")
         
         all_superpred_targets = []
         
+        # Parse both files concurrently; read errors surface from .result()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            known_future = (executor.submit(_read_csv, superpred_known_file, SUPERPRED_DTYPES)
+                            if superpred_known_file is not None else None)
+            pred_future = (executor.submit(_read_csv, superpred_pred_file, SUPERPRED_DTYPES)
+                           if superpred_pred_file is not None else None)
+        
         # Helper to load superpred
-        if os.path.exists(superpred_known_file):
+        if known_future is not None:
             try:
-                known_df = pd.read_csv(superpred_known_file)
+                known_df = known_future.result()
                 known_df['Probability'] = 1.0
-                known_df['Source'] = 'Known'
+                known_df['Source'] = _source_column('Known', len(known_df))
                 if 'Target Name' in known_df.columns:
                     known_df.rename(columns={'Target Name': 'Target'}, inplace=True)
                 all_superpred_targets.append(known_df)
@@ -133,15 +254,27 @@ class TargetPredictor:
             except Exception as e:
                 self.logger.warning(f"⚠ Could not load known binders: {e}")
 
-        if os.path.exists(superpred_pred_file):
+        if pred_future is not None:
             try:
-                pred_df = pd.read_csv(superpred_pred_file)
+                pred_df = pred_future.result()
                 if 'Probability' in pred_df.columns:
-                    # Fix percentage strings
-                    pred_df['Probability'] = pred_df['Probability'].astype(str).str.rstrip('%').astype('float') / 100
+                    if pd.api.types.is_numeric_dtype(pred_df['Probability']):
+                        # Already parsed as numbers (percent values without '%')
+                        pred_df['Probability'] = pred_df['Probability'] / 100
+                    else:
+                        # Fix percentage strings; malformed values become NaN
+                        pred_df['Probability'] = pd.to_numeric(
+                            pred_df['Probability'].astype(str).str.removesuffix('%'),
+                            errors='coerce'
+                        ) / 100
+                    
+                    n_invalid = int(pred_df['Probability'].isna().sum())
+                    if n_invalid:
+                        self.logger.warning(f"⚠ Skipped {n_invalid} predicted targets with unparseable probability")
+                        pred_df = pred_df.dropna(subset=['Probability'])
                 
                 pred_df = pred_df[pred_df['Probability'] > superpred_threshold]
-                pred_df['Source'] = 'Predicted'
+                pred_df['Source'] = _source_column('Predicted', len(pred_df))
                 if 'Target Name' in pred_df.columns:
                     pred_df.rename(columns={'Target Name': 'Target'}, inplace=True)
                 
@@ -151,10 +284,31 @@ class TargetPredictor:
                 self.logger.warning(f"⚠ Could not load predicted targets: {e}")
 
         if all_superpred_targets:
-            self.superpred_targets = pd.concat(all_superpred_targets, ignore_index=True)
-            # Remove duplicates
-            self.superpred_targets = self.superpred_targets.sort_values('Probability', ascending=False)
-            self.superpred_targets = self.superpred_targets.drop_duplicates(subset=['Target'], keep='first')
+            if len(all_superpred_targets) == 1:
+                # Only one file present: nothing to concatenate
+                superpred_targets = all_superpred_targets[0].reset_index(drop=True)
+            else:
+                # Known binders (Probability 1.0) always win, so only append
+                # predicted rows for targets that are not already known.
+                # Probability is deliberately not a join key: the same target
+                # carries different values in the two files.
+                known_df, pred_df = all_superpred_targets
+                # Integer codes over both files make the membership test a numeric np.isin
+                codes, _ = pd.factorize(
+                    pd.concat([known_df['Target'], pred_df['Target']], ignore_index=True)
+                )
+                n_known = len(known_df)
+                pred_df = pred_df[~np.isin(codes[n_known:], codes[:n_known])]
+                superpred_targets = pd.concat([known_df, pred_df], ignore_index=True)
+            # Highest probability first (stable, so known binders lead ties);
+            # then keep the best row per target. drop_duplicates treats NaN
+            # targets as one group, as the saved table always has
+            superpred_targets = superpred_targets.sort_values(
+                'Probability', ascending=False, kind='stable'
+            )
+            if not superpred_targets['Target'].is_unique:
+                superpred_targets = superpred_targets.drop_duplicates(subset=['Target'], keep='first')
+            self.superpred_targets = superpred_targets
             self.logger.info(f"\n✓ SuperPred total: {len(self.superpred_targets)} unique targets")
         else:
             self.logger.warning("\n⚠ No SuperPred targets loaded")
@@ -178,26 +332,49 @@ class TargetPredictor:
     def save_targets(self, output_dir):
         """Save results to CSV."""
         os.makedirs(output_dir, exist_ok=True)
+        # pandas writer on purpose: PyArrow's CSV writer quotes every string
+        # and writes 1.0 as 1 and True as true, changing the saved files
         if self.swiss_targets is not None:
             self.swiss_targets.to_csv(os.path.join(output_dir, "swiss_targets.csv"), index=False)
         if self.superpred_targets is not None:
             self.superpred_targets.to_csv(os.path.join(output_dir, "superpred_targets.csv"), index=False)
     
+    def _gene_indexes(self):
+        """
+        Cleaned, unique gene symbols per source.
+        
+        Computed once and reused until either target table is reassigned.
+        
+        Returns:
+            tuple: (swiss, superpred) pd.Index objects; empty if a source is missing
+        """
+        if self._gene_index_cache is not None:
+            return self._gene_index_cache
+        
+        import pandas as pd
+        
+        def _clean(targets):
+            # Clean up names: upper case, strip spaces; drop missing/empty entries
+            genes = targets.dropna().astype(str).str.upper().str.strip()
+            return pd.Index(genes[(genes != '') & (genes != 'NAN')]).unique()
+        
+        indexes = []
+        for targets in (self.swiss_targets, self.superpred_targets):
+            if targets is not None and 'Target' in targets.columns:
+                indexes.append(_clean(targets['Target']))
+            else:
+                indexes.append(pd.Index([], dtype=object))
+        self._gene_index_cache = tuple(indexes)
+        return self._gene_index_cache
+    
     def get_all_target_genes(self):
-        """Get unique gene symbols from all sources."""
-        all_genes = []
-        
-        if self.swiss_targets is not None and 'Target' in self.swiss_targets.columns:
-            # Clean up names: upper case, strip spaces
-            genes = self.swiss_targets['Target'].astype(str).str.upper().str.strip().tolist()
-            all_genes.extend(genes)
-        
-        if self.superpred_targets is not None and 'Target' in self.superpred_targets.columns:
-            # SuperPred targets are often descriptive names, but sometimes symbols.
-            # We add them, but Swiss is the higher quality source for symbols here.
-            genes = self.superpred_targets['Target'].astype(str).str.upper().str.strip().tolist()
-            all_genes.extend(genes)
-        
-        # Remove duplicates and empty strings
-        unique_genes = list(set([g for g in all_genes if g and g != 'NAN']))
-        return unique_genes
\ No newline at end of file
+        """
+        Get unique gene symbols from all sources.
+        
+        The cleaned per-source genes are cached until ``swiss_targets`` or
+        ``superpred_targets`` is reassigned.
+        """
+        swiss_genes, superpred_genes = self._gene_indexes()
+        # SuperPred targets are often descriptive names, but sometimes symbols.
+        # We add them, but Swiss is the higher quality source for symbols here.
+        return swiss_genes.union(superpred_genes).tolist()
\ No newline at end of file
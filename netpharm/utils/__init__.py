@@ -5,7 +5,17 @@ Utility modules for network pharmacology analysis.
 from .logger import setup_logger
 from .validators import validate_cid, validate_smiles
 from .config_handler import load_config, prompt_user_config
-from .api_wrappers import query_pubchem, query_reactome, query_string, query_gprofiler
+from .api_wrappers import (
+    query_pubchem,
+    query_pubchem_many,
+    query_pubchem_smiles_many,
+    query_reactome,
+    query_reactome_many,
+    query_string,
+    query_string_text,
+    query_gprofiler,
+    query_batch,
+)
 
 __all__ = [
     'setup_logger',
@@ -14,7 +24,12 @@ __all__ = [
     'load_config',
     'prompt_user_config',
     'query_pubchem',
+    'query_pubchem_many',
+    'query_pubchem_smiles_many',
     'query_reactome',
+    'query_reactome_many',
     'query_string',
-    'query_gprofiler'
+    'query_string_text',
+    'query_gprofiler',
+    'query_batch'
 ]
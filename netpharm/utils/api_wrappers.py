@@ -2,19 +2,193 @@
 API wrapper functions for external services.
 """
 
+import functools
+import hashlib
+import inspect
+import json
 import logging
+import os
 import requests
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Optional
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
+
+try:
+    import ijson  # Optional: stream-parse large Reactome responses
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Optional: faster decoding of JSON response bodies
+except ImportError:
+    orjson = None
+
+# Errors raised while decoding a response body
+_PARSE_ERRORS = (ValueError, TypeError) + ((ijson.JSONError,) if ijson is not None else ())
 
 
 logger = logging.getLogger(__name__)
 
 
+def _response_json(response):
+    """Decode a JSON response body, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+# Shared HTTP session: keeps connections alive between calls so repeated
+# requests to the same service skip the TCP/TLS handshake. The adapter only
+# retries once; callers such as PathwayAnalyzer run their own retry loops
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=1,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,
+            allowed_methods=frozenset({"GET", "POST"}),
+        ),
+    ),
+)
+
+# Shared worker pool for issuing independent API calls concurrently
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="netpharm-api")
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter allowing at most ``rps`` requests to start per second.
+    
+    Callers only block when they arrive before the next free slot, so
+    naturally spaced requests (and the last request of a batch) never sleep.
+    """
+    
+    def __init__(self, rps):
+        """
+        Initialize RateLimiter.
+        
+        Args:
+            rps: Maximum requests per second
+        """
+        self.interval = 1.0 / rps
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+    
+    def acquire(self):
+        """Wait until a request may be issued."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+# One limiter per external service
+_RATE_LIMITERS = {
+    "pubchem": RateLimiter(3),
+    "reactome": RateLimiter(2),
+    "string": RateLimiter(1),
+    "gprofiler": RateLimiter(1),
+}
+
+
+# On-disk cache of API responses (disable with NETPHARM_NO_CACHE=1)
+_CACHE_EXPIRE_SECONDS = 7 * 24 * 3600
+
+
 class PathwayProteinFetchError(RuntimeError):
     """Raised when Reactome pathway protein retrieval fails."""
 
 
+def _cache_dir():
+    """Directory for cached API responses (override with NETPHARM_CACHE_DIR)."""
+    return os.environ.get(
+        "NETPHARM_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "netpharm_api")
+    )
+
+
+def _disk_cache(tag, expire=_CACHE_EXPIRE_SECONDS):
+    """
+    Memoize a JSON-serializable API result on disk.
+    
+    The key is built from the bound call arguments; list arguments (gene
+    lists) are sorted so that the same genes in a different order hit the
+    same entry. Failed calls raise as usual and are never cached.
+    
+    Args:
+        tag: Subdirectory name for this function's entries
+        expire: Entry lifetime in seconds
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if os.environ.get("NETPHARM_NO_CACHE"):
+                return fn(*args, **kwargs)
+            
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key_data = {
+                name: sorted(map(str, value)) if isinstance(value, (list, tuple)) else value
+                for name, value in bound.arguments.items()
+            }
+            key = hashlib.sha256(
+                json.dumps(key_data, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()
+            path = os.path.join(_cache_dir(), tag, f"{key}.json")
+            
+            try:
+                if time.time() - os.path.getmtime(path) < expire:
+                    with open(path, "r", encoding="utf-8") as f:
+                        return json.load(f)
+            except (OSError, ValueError):
+                pass  # Missing or unreadable entry: fetch again
+            
+            result = fn(*args, **kwargs)
+            
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(result, f)
+                os.replace(tmp_path, path)
+            except (OSError, TypeError, ValueError):
+                logger.debug("Could not write API cache entry %s", path)
+            
+            return result
+        
+        return wrapper
+    return decorator
+
+
+def query_batch(calls):
+    """
+    Run independent API calls concurrently.
+    
+    Args:
+        calls: List of (function, args, kwargs) tuples
+    
+    Returns:
+        list: concurrent.futures.Future objects in the same order as ``calls``;
+            ``future.result()`` returns the call's result or re-raises its error
+    """
+    return [_EXECUTOR.submit(fn, *args, **kwargs) for fn, args, kwargs in calls]
+
+
+# Tag bumped when SMILES moved from the URL path to the POST body: older
+# entries for SMILES with '#' hold the record of the truncated structure
+@_disk_cache("pubchem-v2")
 def query_pubchem(cid=None, smiles=None):
     """
     Query PubChem for compound information.
@@ -36,16 +210,18 @@ def query_pubchem(cid=None, smiles=None):
     
     if cid:
         url = f"{base_url}/compound/cid/{cid}/property/{properties}/JSON"
+        _RATE_LIMITERS["pubchem"].acquire()  # Respect PubChem rate limits
+        response = _SESSION.get(url, timeout=30)
     elif smiles:
-        url = f"{base_url}/compound/smiles/{smiles}/property/{properties}/JSON"
+        # SMILES go in the form body: '#' and '/' are not safe in a URL path
+        url = f"{base_url}/compound/smiles/property/{properties}/JSON"
+        _RATE_LIMITERS["pubchem"].acquire()
+        response = _SESSION.post(url, data={"smiles": smiles}, timeout=30)
     else:
         raise ValueError("Either CID or SMILES must be provided")
     
-    response = requests.get(url, timeout=30)
-    time.sleep(0.3)  # Respect PubChem rate limits
-    
     if response.status_code == 200:
-        data = response.json()
+        data = _response_json(response)
         result = data['PropertyTable']['Properties'][0]
         
         # Standardize: Ensure CanonicalSMILES exists
@@ -57,7 +233,70 @@ def query_pubchem(cid=None, smiles=None):
         raise requests.RequestException(f"PubChem query failed with status {response.status_code}")
 
 
+# PubChem PUG-REST accepts at most this many CIDs per property request
+_PUBCHEM_BATCH_SIZE = 100
+
+
+def query_pubchem_many(cids):
+    """
+    Query PubChem properties for many CIDs in as few requests as possible.
+    
+    CIDs are sent comma-separated, up to 100 per request, instead of
+    one round trip per compound.
+    
+    Args:
+        cids: Iterable of PubChem Compound IDs
+    
+    Returns:
+        dict: Property dict (same keys as query_pubchem) keyed by int CID;
+            CIDs PubChem does not know are omitted
+    
+    Raises:
+        requests.RequestException: If a query fails
+    """
+    base_url = "https://pubchem.ncbi.nlm.nih.gov/rest/pug"
+    properties = "CanonicalSMILES,IsomericSMILES,ConnectivitySMILES,MolecularFormula,MolecularWeight,IUPACName"
+    
+    cids = list(dict.fromkeys(int(cid) for cid in cids))
+    results = {}
+    for start in range(0, len(cids), _PUBCHEM_BATCH_SIZE):
+        chunk = ",".join(map(str, cids[start:start + _PUBCHEM_BATCH_SIZE]))
+        url = f"{base_url}/compound/cid/{chunk}/property/{properties}/JSON"
+        
+        _RATE_LIMITERS["pubchem"].acquire()  # Respect PubChem rate limits
+        response = _SESSION.get(url, timeout=30)
+        
+        if response.status_code == 404:
+            continue  # None of the CIDs in this chunk exist
+        if response.status_code != 200:
+            raise requests.RequestException(f"PubChem query failed with status {response.status_code}")
+        
+        for result in _response_json(response)['PropertyTable']['Properties']:
+            if 'CanonicalSMILES' not in result and 'ConnectivitySMILES' in result:
+                result['CanonicalSMILES'] = result['ConnectivitySMILES']
+            results[result['CID']] = result
+    
+    return results
+
 
+def query_pubchem_smiles_many(smiles_list):
+    """
+    Query PubChem for several SMILES concurrently.
+    
+    PUG-REST takes one SMILES per request, so lookups run on the shared
+    worker pool; the PubChem rate limiter still spaces their starts.
+    
+    Args:
+        smiles_list: SMILES strings
+    
+    Returns:
+        list: Futures resolving to the query_pubchem() result for each SMILES
+    """
+    return query_batch([(query_pubchem, (), {'smiles': smiles}) for smiles in smiles_list])
+
+
+
+@_disk_cache("reactome")
 def query_reactome(query_term, species="Homo sapiens"):
     """
     Search Reactome for pathways with robust error handling.
@@ -81,11 +320,11 @@ def query_reactome(query_term, species="Homo sapiens"):
     }
     
     try:
-        response = requests.get(base_url, params=params, timeout=30)
-        time.sleep(0.5)
+        _RATE_LIMITERS["reactome"].acquire()
+        response = _SESSION.get(base_url, params=params, timeout=30)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _response_json(response)
             if 'results' in data and data['results']:
                 return data['results']
             return []
@@ -103,6 +342,99 @@ def query_reactome(query_term, species="Homo sapiens"):
 
 
 
+def query_reactome_many(terms, species="Homo sapiens"):
+    """
+    Search Reactome for several terms concurrently.
+    
+    Requests are still spaced according to Reactome's rate limit, but their
+    network latency overlaps.
+    
+    Args:
+        terms: Search keywords or pathway IDs
+        species: Species name
+    
+    Returns:
+        list: Futures resolving to the query_reactome() result for each term
+    """
+    return query_batch([(query_reactome, (term,), {'species': species}) for term in terms])
+
+
+# Reactome reference classes that denote UniProt entries
+_UNIPROT_CLASSES = frozenset({'ReferenceGeneProduct', 'ReferenceIsoform'})
+
+
+def _parse_participants(participants):
+    """
+    Extract UniProt proteins from Reactome 'participants' physical entities.
+    
+    Args:
+        participants: Iterable of physical entity dicts
+    
+    Returns:
+        list: List of protein dictionaries
+    """
+    proteins = []
+    append = proteins.append
+
+    # Iterate through the physical entities (PEs)
+    for pe in participants:
+        # UniProt info is nested inside 'refEntities'
+        ref_entities = pe.get('refEntities')
+        if not ref_entities:
+            continue
+
+        pe_name = pe.get('displayName')
+        protein_name = 'N/A' if pe_name is None else pe_name
+
+        for ref in ref_entities:
+            # Robustly check if this is a UniProt entry
+            # The API response often omits 'databaseName', so we check multiple fields
+            st = ref.get('stId')
+            dn = ref.get('displayName')
+            is_uniprot = (
+                ref.get('databaseName') == 'UniProt'
+                or ref.get('schemaClass') in _UNIPROT_CLASSES
+                or (st is not None and str(st).startswith('uniprot:'))
+                or (dn is not None and str(dn).startswith('UniProt:'))
+            )
+            if not is_uniprot:
+                continue
+
+            # 1. Extract UniProt ID
+            uniprot_id = ref.get('identifier', 'N/A')
+
+            # 2. Extract Gene Name (try multiple sources)
+            gene_name = None
+
+            # Try explicit geneName list in refEntity
+            gene_names = ref.get('geneName')
+            if gene_names:
+                gene_name = gene_names[0]
+
+            # Try parsing refEntity displayName (e.g., "UniProt:P07333 CSF1R")
+            if not gene_name and dn is not None:
+                parts = dn.split(' ')
+                if len(parts) > 1:
+                    gene_name = parts[-1]
+
+            # Try parsing PhysicalEntity displayName (e.g., "CSF1R [plasma membrane]")
+            if not gene_name and pe_name is not None:
+                # Take the part before the first bracket
+                gene_name = pe_name.split(' [')[0]
+
+            if not gene_name:
+                gene_name = 'Unknown'
+
+            append({
+                'gene_name': gene_name,
+                'uniprot_id': uniprot_id,
+                'protein_name': protein_name
+            })
+
+    return proteins
+
+
+@_disk_cache("reactome_participants")
 def get_pathway_proteins(pathway_id):
     """
     Get proteins in a specific Reactome pathway.
@@ -115,10 +447,11 @@ def get_pathway_proteins(pathway_id):
     """
     # Use the 'participants' endpoint - it returns 200 OK for Pathways
     url = f"https://reactome.org/ContentService/data/participants/{pathway_id}"
+    response = None
     
     try:
-        response = requests.get(url, timeout=30)
-        time.sleep(0.5)
+        _RATE_LIMITERS["reactome"].acquire()
+        response = _SESSION.get(url, timeout=30, stream=ijson is not None)
 
         if response.status_code != 200:
             logger.error(
@@ -132,63 +465,18 @@ def get_pathway_proteins(pathway_id):
                 f"Reactome returned status {response.status_code} for pathway {pathway_id}"
             )
 
-        proteins = []
-        data = response.json()
+        if ijson is not None:
+            # Decode entities as they arrive instead of holding the whole document
+            response.raw.decode_content = True
+            participants = ijson.items(response.raw, 'item', use_float=True)
+        else:
+            participants = _response_json(response)
 
-        # Iterate through the physical entities (PEs)
-        for pe in data:
-            # UniProt info is nested inside 'refEntities'
-            ref_entities = pe.get('refEntities', [])
-            if not ref_entities:
-                continue
+        return _parse_participants(participants)
 
-            for ref in ref_entities:
-                # Robustly check if this is a UniProt entry
-                # The API response often omits 'databaseName', so we check multiple fields
-                is_uniprot = False
-                if ref.get('databaseName') == 'UniProt':
-                    is_uniprot = True
-                elif ref.get('schemaClass') in ['ReferenceGeneProduct', 'ReferenceIsoform']:
-                    is_uniprot = True
-                elif str(ref.get('stId', '')).startswith('uniprot:'):
-                    is_uniprot = True
-                elif str(ref.get('displayName', '')).startswith('UniProt:'):
-                    is_uniprot = True
-
-                if is_uniprot:
-                    # 1. Extract UniProt ID
-                    uniprot_id = ref.get('identifier', 'N/A')
-
-                    # 2. Extract Gene Name (try multiple sources)
-                    gene_name = None
-
-                    # Try explicit geneName list in refEntity
-                    if 'geneName' in ref and ref['geneName']:
-                        gene_name = ref['geneName'][0]
-
-                    # Try parsing refEntity displayName (e.g., "UniProt:P07333 CSF1R")
-                    if not gene_name and 'displayName' in ref:
-                        parts = ref['displayName'].split(' ')
-                        if len(parts) > 1:
-                            gene_name = parts[-1]
-
-                    # Try parsing PhysicalEntity displayName (e.g., "CSF1R [plasma membrane]")
-                    if not gene_name and 'displayName' in pe:
-                        # Take the part before the first bracket
-                        gene_name = pe['displayName'].split(' [')[0]
-
-                    if not gene_name:
-                        gene_name = 'Unknown'
-
-                    proteins.append({
-                        'gene_name': gene_name,
-                        'uniprot_id': uniprot_id,
-                        'protein_name': pe.get('displayName', 'N/A')
-                    })
-
-        return proteins
-
-    except requests.RequestException as exc:
+    except (requests.RequestException, Urllib3HTTPError) as exc:
+        # Streamed bodies are read by ijson straight from urllib3, so errors
+        # during the download arrive unwrapped (ProtocolError, ReadTimeoutError)
         logger.exception(
             "Reactome pathway protein request raised exception "
             "for pathway_id=%s url=%s",
@@ -198,7 +486,7 @@ def get_pathway_proteins(pathway_id):
         raise PathwayProteinFetchError(
             f"Request failed while fetching pathway proteins for {pathway_id}"
         ) from exc
-    except (ValueError, TypeError) as exc:
+    except _PARSE_ERRORS as exc:
         logger.exception(
             "Reactome pathway protein response parsing failed "
             "for pathway_id=%s url=%s",
@@ -208,11 +496,34 @@ def get_pathway_proteins(pathway_id):
         raise PathwayProteinFetchError(
             f"Failed to parse pathway protein response for {pathway_id}"
         ) from exc
+    finally:
+        if response is not None:
+            response.close()
 
 
-def query_string(gene_list: List[str], species: int = 9606, required_score: int = 700):
+def get_pathway_proteins_batch(pathway_ids):
     """
-    Query STRING database for protein interactions.
+    Fetch proteins for several Reactome pathways concurrently.
+    
+    Reactome has no multi-pathway participants endpoint, so this fans out
+    one get_pathway_proteins() call per pathway on the shared worker pool
+    (rate-limited per host).
+    
+    Args:
+        pathway_ids: Reactome pathway IDs
+    
+    Returns:
+        dict: Pathway ID -> Future resolving to the list of protein dictionaries
+    """
+    pathway_ids = list(dict.fromkeys(pathway_ids))
+    futures = query_batch([(get_pathway_proteins, (pid,), {}) for pid in pathway_ids])
+    return dict(zip(pathway_ids, futures))
+
+
+@_disk_cache("string")
+def query_string_text(gene_list: List[str], species: int = 9606, required_score: int = 700):
+    """
+    Query STRING database for protein interactions as raw TSV.
     
     Args:
         gene_list: List of gene names
@@ -220,7 +531,7 @@ def query_string(gene_list: List[str], species: int = 9606, required_score: int
         required_score: Minimum interaction score (0-1000)
     
     Returns:
-        dict: Interactions data
+        str: Tab-separated interactions table
     """
     string_api_url = "https://string-db.org/api/tsv/network"
     
@@ -231,8 +542,8 @@ def query_string(gene_list: List[str], species: int = 9606, required_score: int
         "network_type": "functional"
     }
     
-    response = requests.post(string_api_url, data=params, timeout=60)
-    time.sleep(1)
+    _RATE_LIMITERS["string"].acquire()
+    response = _SESSION.post(string_api_url, data=params, timeout=60)
     
     if response.status_code == 200:
         return response.text
@@ -240,6 +551,34 @@ def query_string(gene_list: List[str], species: int = 9606, required_score: int
         raise requests.RequestException(f"STRING query failed with status {response.status_code}")
 
 
+# STRING TSV columns holding identifiers rather than numbers
+def query_string(gene_list: List[str], species: int = 9606, required_score: int = 700):
+    """
+    Query STRING database for protein interactions.
+    
+    Unlike earlier releases, which returned the raw TSV text, this
+    parses the body in a single read_csv pass; use query_string_text()
+    for the raw response.
+    
+    Args:
+        gene_list: List of gene names
+        species: NCBI taxonomy ID (9606 = Homo sapiens)
+        required_score: Minimum interaction score (0-1000)
+    
+    Returns:
+        pd.DataFrame: One row per interaction, every column kept as the
+        original string (scores are not converted, blanks stay "")
+    """
+    import io
+    import pandas as pd
+    
+    text = query_string_text(gene_list, species=species, required_score=required_score)
+    # Same cells as splitting the TSV by hand: no type inference, so
+    # identifiers like "9606.E1" and score strings round-trip unchanged
+    return pd.read_csv(io.StringIO(text), sep="\t", dtype=str, keep_default_na=False)
+
+
+@_disk_cache("gprofiler")
 def query_gprofiler(gene_list: List[str], organism: str = "hsapiens"):
     """
     Query g:Profiler for functional enrichment.
@@ -261,10 +600,13 @@ def query_gprofiler(gene_list: List[str], organism: str = "hsapiens"):
         "significance_threshold_method": "fdr"
     }
     
-    response = requests.post(url, json=payload, timeout=60)
-    time.sleep(1)
+    body = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    
+    _RATE_LIMITERS["gprofiler"].acquire()
+    response = _SESSION.post(url, data=body, headers=headers, timeout=60)
     
     if response.status_code == 200:
-        return response.json()
+        return _response_json(response)
     else:
         raise requests.RequestException(f"g:Profiler query failed with status {response.status_code}")
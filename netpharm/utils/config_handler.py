@@ -2,14 +2,46 @@
 Configuration handling - loading from YAML or prompting user.
 """
 
+import json
 import yaml
+import mmap
 import os
 
+try:
+    import orjson  # Optional: faster sidecar (de)serialization
+except ImportError:
+    orjson = None
+
+
+# C-accelerated libyaml loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Configs at least this large are memory-mapped rather than read through a buffer
+_MMAP_MIN_BYTES = 64 * 1024
+
+
+def _json_dumps(obj):
+    """Serialize to JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _json_loads(data):
+    """Parse JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def load_config(config_path):
     """
     Load configuration from YAML file.
     
+    The parsed result is saved next to the YAML as ``<config>.cache.json``
+    together with the YAML's mtime and size, and reused only while both
+    still match exactly.
+    
     Args:
         config_path: Path to YAML config file
     
@@ -20,15 +52,69 @@ def load_config(config_path):
         FileNotFoundError: If config file doesn't exist
         yaml.YAMLError: If config file is invalid
     """
-    if not os.path.exists(config_path):
-        raise FileNotFoundError(f"Config file not found: {config_path}")
-    
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    try:
+        f = open(config_path, 'rb')
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config file not found: {config_path}") from None
+    
+    # Binary reads: the parser detects the encoding and decodes UTF-8 itself
+    with f:
+        config_stat = os.fstat(f.fileno())
+        
+        # Reuse the compiled sidecar only if it was built from this exact
+        # file version; a replaced YAML (mv, cp -p, restore) may be older
+        cache_path = config_path + ".cache.json"
+        source = [config_stat.st_mtime_ns, config_stat.st_size]
+        try:
+            with open(cache_path, 'rb') as cache_file:
+                cached = _json_loads(cache_file.read())
+            if cached.get('source') == source:
+                return cached['config']
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass  # Missing, stale or corrupt sidecar: parse the YAML
+        
+        if config_stat.st_size >= _MMAP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                config = yaml.load(mm, Loader=_YAML_LOADER)
+        else:
+            config = yaml.load(f, Loader=_YAML_LOADER)
+    
+    try:
+        data = _json_dumps({'source': source, 'config': config})
+        # Only cache configs that survive JSON unchanged (no dates, non-str keys, ...)
+        if _json_loads(data)['config'] == config:
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        pass  # Read-only location or unserializable config: skip the sidecar
     
     return config
 
 
+def _prompt_float(prompt, default, name):
+    """
+    Prompt until the user enters a number or accepts the default.
+    
+    Args:
+        prompt: Text shown to the user
+        default: Value used when the input is left empty
+        name: Field name used in the error message
+    
+    Returns:
+        float: Entered or default value
+    """
+    while True:
+        value = input(prompt).strip()
+        if not value:
+            return default
+        try:
+            return float(value)
+        except ValueError:
+            print(f"❌ Invalid {name}. Please enter a number.")
+
+
 def prompt_user_config():
     """
     Interactively prompt user for configuration.
@@ -59,27 +145,10 @@ def prompt_user_config():
     print("\n--- TARGET PREDICTION THRESHOLDS ---")
     print("📄 Paper defaults: SwissTargetPrediction=0.0, SuperPred=0.5")
 
-    while True:
-        swiss_thresh_input = input("SwissTargetPrediction threshold [0.0]: ").strip()
-        if not swiss_thresh_input:
-            swiss_thresh = 0.0
-            break
-        try:
-            swiss_thresh = float(swiss_thresh_input)
-            break
-        except ValueError:
-            print("❌ Invalid SwissTargetPrediction threshold. Please enter a number.")
-
-    while True:
-        superpred_thresh_input = input("SuperPred threshold [0.5]: ").strip()
-        if not superpred_thresh_input:
-            superpred_thresh = 0.5
-            break
-        try:
-            superpred_thresh = float(superpred_thresh_input)
-            break
-        except ValueError:
-            print("❌ Invalid SuperPred threshold. Please enter a number.")
+    swiss_thresh = _prompt_float(
+        "SwissTargetPrediction threshold [0.0]: ", 0.0, "SwissTargetPrediction threshold"
+    )
+    superpred_thresh = _prompt_float("SuperPred threshold [0.5]: ", 0.5, "SuperPred threshold")
     
     config['target_prediction'] = {
         'swiss_threshold': swiss_thresh,
@@ -103,16 +172,9 @@ def prompt_user_config():
     
     # STRING network parameters
     print("\n--- STRING NETWORK PARAMETERS ---")
-    while True:
-        string_conf_input = input("STRING confidence threshold [0.700]: ").strip()
-        if not string_conf_input:
-            string_conf = 0.700
-            break
-        try:
-            string_conf = float(string_conf_input)
-            break
-        except ValueError:
-            print("❌ Invalid STRING confidence threshold. Please enter a number.")
+    string_conf = _prompt_float(
+        "STRING confidence threshold [0.700]: ", 0.700, "STRING confidence threshold"
+    )
     
     config['string'] = {'confidence': string_conf}
     
@@ -147,9 +209,8 @@ def get_config(config_path=None):
         dict: Configuration dictionary
     """
     if config_path:
-        if os.path.exists(config_path):
-            print(f"Loading configuration from: {config_path}")
-            return load_config(config_path)
-        raise FileNotFoundError(f"Config file not found: {config_path}")
+        # load_config raises FileNotFoundError itself; no separate probe
+        print(f"Loading configuration from: {config_path}")
+        return load_config(config_path)
 
     return prompt_user_config()
@@ -1,10 +1,20 @@
 """
 Logging configuration for the network pharmacology tool.
+
+Debug records go only to the log file; pass arguments lazily
+(``logger.debug("msg %s", obj)``) rather than as f-strings so that
+filtered records are never formatted.
 """
 
 import logging
 import os
 from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+
+# Log file rotation: keep at most LOG_BACKUP_COUNT files of LOG_MAX_BYTES each
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
 
 
 def setup_logger(output_dir, compound_id):
@@ -36,7 +46,11 @@ def setup_logger(output_dir, compound_id):
     os.makedirs(output_dir, exist_ok=True)
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     log_file = os.path.join(output_dir, f'{compound_id}_{timestamp}.log')
-    file_handler = logging.FileHandler(log_file)
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT
+    )
     file_handler.setLevel(logging.DEBUG)
     file_format = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
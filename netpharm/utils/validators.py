@@ -6,6 +6,13 @@ import re
 from typing import Union
 
 
+# Reactome IDs format: R-HSA-XXXXXX or R-MMU-XXXXXX, etc.
+_REACTOME_ID_RE = re.compile(r"^R-[A-Z]{3}-\d+$")
+
+# Deletes every character allowed in a SMILES string; anything left over is invalid
+_SMILES_DELETE = str.maketrans('', '', 'CNOPSFClBrI[]()=#@+-\\/0123456789cnops')
+
+
 def validate_cid(cid: Union[str, int]) -> int:
     """
     Validate PubChem CID format.
@@ -28,6 +35,44 @@ def validate_cid(cid: Union[str, int]) -> int:
         raise ValueError(f"Invalid CID format: {cid}. Must be a positive integer.")
 
 
+def validate_cids(cids):
+    """
+    Validate many PubChem CIDs in one vectorized pass.
+    
+    Args:
+        cids: Iterable of compound IDs (strings or ints)
+    
+    Returns:
+        np.ndarray: Valid CIDs as int64
+    
+    Raises:
+        ValueError: If any CID is invalid (the first offending index is reported)
+    """
+    import numpy as np
+    
+    cids = list(cids)
+    try:
+        cid_array = np.asarray(cids, dtype=np.int64)
+    except (ValueError, TypeError, OverflowError):
+        # Not all castable: validate one by one and report the first offending
+        # entry, including CIDs too large for int64
+        values = []
+        for i, cid in enumerate(cids):
+            try:
+                values.append(np.int64(validate_cid(cid)))
+            except (ValueError, TypeError, OverflowError):
+                raise ValueError(
+                    f"Invalid CID format at index {i}: {cid}. Must be a positive integer."
+                ) from None
+        cid_array = np.array(values, dtype=np.int64)
+    
+    invalid = np.flatnonzero(cid_array <= 0)
+    if invalid.size:
+        i = int(invalid[0])
+        raise ValueError(f"Invalid CID format at index {i}: {cids[i]}. Must be a positive integer.")
+    return cid_array
+
+
 def validate_smiles(smiles: str) -> str:
     """
     Basic SMILES format validation.
@@ -48,8 +93,7 @@ def validate_smiles(smiles: str) -> str:
         raise ValueError("SMILES string too short")
     
     # Basic character check
-    allowed_chars = set('CNOPSFClBrI[]()=#@+-\\/0123456789cnops')
-    if not all(c in allowed_chars for c in smiles):
+    if smiles.translate(_SMILES_DELETE):
         raise ValueError(f"SMILES contains invalid characters: {smiles}")
     
     return smiles.strip()
@@ -85,6 +129,50 @@ def validate_threshold(
         raise ValueError(f"Invalid threshold: {threshold}")
 
 
+def validate_thresholds(
+    thresholds,
+    min_val: float = 0.0,
+    max_val: float = 1.0,
+):
+    """
+    Validate many probability thresholds in one vectorized pass.
+    
+    Args:
+        thresholds: Iterable of threshold values
+        min_val: Minimum allowed value
+        max_val: Maximum allowed value
+    
+    Returns:
+        np.ndarray: Valid thresholds as float64
+    
+    Raises:
+        ValueError: If any threshold is invalid (the first offending index is reported)
+    """
+    import numpy as np
+    
+    thresholds = list(thresholds)
+    try:
+        threshold_array = np.asarray(thresholds, dtype=np.float64)
+    except (ValueError, TypeError):
+        for i, threshold in enumerate(thresholds):
+            try:
+                float(threshold)
+            except (ValueError, TypeError):
+                raise ValueError(f"Invalid threshold at index {i}: {threshold}")
+        raise
+    
+    # NaN compares False on both sides, so it is reported as out of range
+    with np.errstate(invalid='ignore'):
+        invalid = np.flatnonzero(~((threshold_array >= min_val) & (threshold_array <= max_val)))
+    if invalid.size:
+        i = int(invalid[0])
+        raise ValueError(
+            f"Invalid threshold at index {i}: {thresholds[i]}. "
+            f"Must be between {min_val} and {max_val}"
+        )
+    return threshold_array
+
+
 def validate_pathway_id(pathway_id: str) -> str:
     """
     Validate Reactome pathway ID format.
@@ -98,10 +186,8 @@ def validate_pathway_id(pathway_id: str) -> str:
     Raises:
         ValueError: If pathway ID is invalid
     """
-    # Reactome IDs format: R-HSA-XXXXXX or R-MMU-XXXXXX, etc.
-    pattern = r"^R-[A-Z]{3}-\d+$"
-    if not re.match(pattern, pathway_id):
+    if not _REACTOME_ID_RE.match(pathway_id):
         raise ValueError(
             f"Invalid Reactome pathway ID format: {pathway_id}"
         )
-    return pathway_id, str
+    return pathway_id
@@ -6,11 +6,26 @@ All biological or statistical decisions are assumed
 to be made upstream (core / analysis).
 """
 
+import hashlib
 import os
-import matplotlib.pyplot as plt
+from itertools import chain
 import networkx as nx
 import numpy as np
-from matplotlib.lines import Line2D
+
+
+# PNG text chunk holding the render signature of a saved plot
+_SIGNATURE_KEY = "netpharm-signature"
+
+
+def _png_signature(path):
+    """Render signature stored in an existing PNG, or None."""
+    try:
+        from PIL import Image
+
+        with Image.open(path) as img:
+            return img.text.get(_SIGNATURE_KEY)
+    except (OSError, AttributeError):
+        return None
 
 
 class NetworkVisualizer:
@@ -25,9 +40,17 @@ class NetworkVisualizer:
     - Edge width reflects STRING confidence
     """
 
-    def __init__(self, output_dir, logger=None):
+    def __init__(self, output_dir, logger=None, dpi=300, output_format="png"):
         self.output_dir = output_dir
         self.logger = logger
+        # PNG resolution; lower values trade detail for faster rendering
+        self.dpi = dpi
+        # "png" (raster) or "svg"/"svgz"/"pdf" (vector, no rasterization)
+        self.output_format = output_format.lower()
+        if self.output_format not in ("png", "svg", "svgz", "pdf"):
+            raise ValueError(f"Unsupported output format: {output_format}")
+        # Spring layouts already computed, keyed by plotted subgraph
+        self._layout_cache = {}
 
     # ------------------------------------------------------------------
     # Public API
@@ -53,6 +76,88 @@ class NetworkVisualizer:
             label_connectors=label_connectors,
         )
 
+    # ------------------------------------------------------------------
+    # Subgraph & layout
+    # ------------------------------------------------------------------
+
+    def _hub_subgraph(self, G, hub_nodes):
+        """
+        Induced subgraph of hubs + first neighbors, with weak
+        connectors removed.
+        """
+        # Build node set: hubs + first neighbors
+        hub_set = set(hub_nodes)
+        adj = G.adj
+        nodes_to_plot = set(chain(hub_set, *(adj[h] for h in hub_set)))
+
+        # Induced subgraph; dense networks where the hubs reach every
+        # node get a plain copy, skipping the filtered subgraph view
+        if len(nodes_to_plot) == G.number_of_nodes():
+            G_plot = G.copy()
+        else:
+            G_plot = G.subgraph(nodes_to_plot).copy()
+
+        # Remove weak connectors (degree < 2 inside subgraph). Degrees
+        # are tracked in a dict so each removal lowers its neighbours'
+        # counts, exactly as removing the nodes one by one would
+        deg = dict(G_plot.degree())
+        weak = []
+        for node in G_plot:
+            if node not in hub_set and deg[node] < 2:
+                weak.append(node)
+                for nbr in G_plot.adj[node]:
+                    deg[nbr] -= 1
+        G_plot.remove_nodes_from(weak)
+        return G_plot
+
+    def _spring_layout(self, G_plot):
+        """
+        Spring layout for the plotted subgraph, computed once per
+        distinct subgraph (nodes, edges and weights) and reused by
+        later plots of the same graph.
+        """
+        key = (
+            frozenset(G_plot.nodes()),
+            frozenset(
+                (frozenset((u, v)), d.get("weight"))
+                for u, v, d in G_plot.edges(data=True)
+            ),
+        )
+        pos = self._layout_cache.get(key)
+        if pos is None:
+            try:
+                pos = nx.spring_layout(G_plot, seed=42)
+            except ImportError:
+                # NetworkX switches to a SciPy sparse solver at >= 500
+                # nodes; without SciPy use the NumPy-only ForceAtlas2
+                if self.logger:
+                    self.logger.warning(
+                        "⚠ SciPy not installed: using ForceAtlas2 layout for "
+                        f"{G_plot.number_of_nodes()} nodes (pip install scipy "
+                        "for the faster sparse spring layout)"
+                    )
+                pos = nx.forceatlas2_layout(G_plot, max_iter=100, seed=42, weight="weight")
+            self._layout_cache[key] = pos
+        return pos
+
+    def _render_signature(self, G, hub_nodes, label_connectors):
+        """
+        Fingerprint of everything the static plot is drawn from: the
+        live input graph (nodes and weighted edges), hubs, labelling,
+        resolution and output format.
+        """
+        edges = sorted(
+            tuple(sorted((str(u), str(v)))) + (w,)
+            for u, v, w in G.edges(data="weight", default=1.0)
+        )
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr(sorted(map(str, G.nodes()))).encode())
+        h.update(repr(edges).encode())
+        h.update(repr((
+            list(hub_nodes), bool(label_connectors), self.dpi, self.output_format,
+        )).encode())
+        return h.hexdigest()
+
     # ------------------------------------------------------------------
     # Core plotting logic
     # ------------------------------------------------------------------
@@ -67,23 +172,10 @@ class NetworkVisualizer:
         Plot hubs + first neighbors (connectors),
         enforcing strict graph consistency.
         """
-
-        # --------------------------------------------------------------
-        # 1. Build node set: hubs + first neighbors
-        # --------------------------------------------------------------
-        nodes_to_plot = set(hub_nodes)
-        for h in hub_nodes:
-            nodes_to_plot.update(G.neighbors(h))
-
-        # Induced subgraph
-        G_plot = G.subgraph(nodes_to_plot).copy()
-
         # --------------------------------------------------------------
-        # 2. Remove weak connectors (degree < 2 inside subgraph)
+        # 1-2. Hubs + first neighbors, without weak connectors
         # --------------------------------------------------------------
-        for node in list(G_plot.nodes()):
-            if node not in hub_nodes and G_plot.degree(node) < 2:
-                G_plot.remove_node(node)
+        G_plot = self._hub_subgraph(G, hub_nodes)
 
         if self.logger:
             self.logger.info(
@@ -91,41 +183,58 @@ class NetworkVisualizer:
                 f"Connectors: {len(G_plot.nodes()) - len(hub_nodes)}"
             )
 
-        # --------------------------------------------------------------
-        # 3. Layout (ONLY on G_plot)
-        # --------------------------------------------------------------
-        pos = nx.spring_layout(G_plot, seed=42)
+        # Skip rendering if the existing PNG was drawn from the same inputs
+        out_path = os.path.join(
+            self.output_dir,
+            f"network_static_hubs_connectors.{self.output_format}",
+        )
+        is_png = self.output_format == "png"
+        signature = self._render_signature(G, hub_nodes, label_connectors)
+        if is_png and _png_signature(out_path) == signature:
+            if self.logger:
+                self.logger.info(f"✓ Network visualization up to date: {out_path}")
+            return
+
+        # Deferred: pyplot is the slowest import in the package
+        import matplotlib.pyplot as plt
+        from matplotlib.lines import Line2D
 
         # --------------------------------------------------------------
-        # 4. Node sizes = degree in G_plot
+        # 3. Layout (ONLY on G_plot)
         # --------------------------------------------------------------
-        node_sizes = [
-            300 + 80 * G_plot.degree(n)
-            for n in G_plot.nodes()
-        ]
+        pos = self._spring_layout(G_plot)
 
         # --------------------------------------------------------------
-        # 5. Node colors (hubs vs connectors)
+        # 4-5. Node sizes (degree in G_plot), colors (hubs vs
+        #      connectors) and labels, in a single pass over G_plot
         # --------------------------------------------------------------
-        node_colors = [
-            "#d62728" if n in hub_nodes else "#1f77b4"
-            for n in G_plot.nodes()
-        ]
+        hub_set = set(hub_nodes)
+        degrees = np.empty(G_plot.number_of_nodes())
+        node_colors = []
+        add_color = node_colors.append
+        labels = {n: n for n in hub_nodes}
+        for i, (n, d) in enumerate(G_plot.degree()):
+            degrees[i] = d
+            if n in hub_set:
+                add_color("#d62728")
+            else:
+                add_color("#1f77b4")
+                if label_connectors:
+                    labels[n] = n
+        node_sizes = 300 + 80 * degrees
 
         # --------------------------------------------------------------
         # 6. Edge widths = normalized STRING confidence
         # --------------------------------------------------------------
-        weights = [
-            G_plot[u][v].get("weight", 1.0)
-            for u, v in G_plot.edges()
-        ]
+        weights = np.fromiter(
+            (w for _, _, w in G_plot.edges(data="weight", default=1.0)),
+            dtype=float,
+            count=G_plot.number_of_edges(),
+        )
 
         if len(weights) > 0:
-            w_min, w_max = min(weights), max(weights)
-            edge_widths = [
-                1.5 + 4.0 * (w - w_min) / (w_max - w_min + 1e-6)
-                for w in weights
-            ]
+            w_min = weights.min()
+            edge_widths = 1.5 + 4.0 * (weights - w_min) / (weights.max() - w_min + 1e-6)
         else:
             edge_widths = []
 
@@ -141,6 +250,8 @@ class NetworkVisualizer:
             width=edge_widths,
             edge_color="gray",
             alpha=0.7,
+            # Always a single LineCollection, never one FancyArrowPatch per edge
+            arrows=False,
         )
 
         nx.draw_networkx_nodes(
@@ -156,12 +267,6 @@ class NetworkVisualizer:
         # --------------------------------------------------------------
         # 8. Labels
         # --------------------------------------------------------------
-        labels = {n: n for n in hub_nodes}
-        if label_connectors:
-            for n in G_plot.nodes():
-                if n not in hub_nodes:
-                    labels[n] = n
-
         nx.draw_networkx_labels(
             G_plot,
             pos,
@@ -220,13 +325,20 @@ class NetworkVisualizer:
         # --------------------------------------------------------------
         # 10. Save
         # --------------------------------------------------------------
-        out_path = os.path.join(
-            self.output_dir,
-            "network_static_hubs_connectors.png",
-        )
-        plt.tight_layout()
-        plt.savefig(out_path, dpi=300)
-        plt.close()
+        fig.tight_layout()
+        if is_png:
+            # zlib level 3 encodes the same pixels noticeably faster than
+            # PIL's default level 6 at a similar file size
+            fig.savefig(
+                out_path,
+                dpi=self.dpi,
+                metadata={_SIGNATURE_KEY: signature},
+                pil_kwargs={"compress_level": 3},
+            )
+        else:
+            # Vector output: no rasterization, dpi does not apply
+            fig.savefig(out_path, format=self.output_format)
+        plt.close(fig)
 
         if self.logger:
             self.logger.info(f"✓ Saved network visualization: {out_path}")
@@ -2,15 +2,58 @@
 Basic smoke tests for network pharmacology tool.
 """
 
+import json
 import pytest
 import sys
 import os
+import logging
+
+import pandas as pd
 
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from netpharm.utils.validators import validate_cid, validate_smiles, validate_threshold
-from netpharm.utils.api_wrappers import query_pubchem
+from netpharm.utils.validators import (
+    validate_cid,
+    validate_cids,
+    validate_smiles,
+    validate_threshold,
+    validate_thresholds,
+)
+from netpharm.utils import api_wrappers
+from netpharm.utils.api_wrappers import (
+    query_pubchem,
+    query_pubchem_many,
+    query_pubchem_smiles_many,
+    _disk_cache,
+)
+from netpharm import compound
+from netpharm.compound import CompoundRetriever
+from netpharm.targets import TargetPredictor
+from netpharm.utils.config_handler import load_config
+from netpharm.visualize import NetworkVisualizer
+
+
+@pytest.fixture(autouse=True)
+def isolated_api_cache(tmp_path, monkeypatch):
+    """Keep API cache entries out of ~/.cache and fresh for every test."""
+    monkeypatch.setenv('NETPHARM_CACHE_DIR', str(tmp_path / 'api_cache'))
+
+
+@pytest.fixture
+def pubchem_response():
+    """Factory for fake PubChem property-table responses."""
+    class FakeResponse:
+        status_code = 200
+        
+        def __init__(self, properties):
+            self.payload = {'PropertyTable': {'Properties': list(properties)}}
+            self.content = json.dumps(self.payload).encode()
+        
+        def json(self):
+            return self.payload
+    
+    return FakeResponse
 
 
 class TestValidators:
@@ -51,6 +94,75 @@ class TestValidators:
             validate_threshold(1.5)  # Too high
         with pytest.raises(ValueError):
             validate_threshold(-0.1)  # Too low
+    
+    def test_validate_batches(self):
+        """Test vectorized CID and threshold validation."""
+        assert validate_cids([969516, "2244"]).tolist() == [969516, 2244]
+        assert validate_thresholds([0.0, "0.5", 1.0]).tolist() == [0.0, 0.5, 1.0]
+        
+        with pytest.raises(ValueError, match="index 1"):
+            validate_cids([969516, 0])
+        with pytest.raises(ValueError, match="index 2"):
+            validate_cids([1, 2, "invalid"])
+        with pytest.raises(ValueError, match="index 1"):
+            validate_cids([1, 2**70])
+        with pytest.raises(ValueError, match="index 1"):
+            validate_thresholds([0.5, float("nan")])
+
+
+class TestConfig:
+    """Test YAML config loading and its JSON sidecar."""
+    
+    def test_sidecar_reused_while_config_unchanged(self, tmp_path):
+        """Test the sidecar is read instead of the unchanged YAML."""
+        config_path = tmp_path / 'config.yaml'
+        config_path.write_text("compound:\n  cid: 969516\n")
+        cache_path = tmp_path / 'config.yaml.cache.json'
+        
+        assert load_config(str(config_path)) == {'compound': {'cid': 969516}}
+        assert cache_path.exists()
+        
+        # A marker written into the sidecar proves it is what gets returned
+        cached = json.loads(cache_path.read_text())
+        cached['config']['compound']['cid'] = 1
+        cache_path.write_text(json.dumps(cached))
+        assert load_config(str(config_path)) == {'compound': {'cid': 1}}
+    
+    def test_sidecar_skipped_after_edit(self, tmp_path):
+        """Test an edited config (size or mtime) is parsed again."""
+        config_path = tmp_path / 'config.yaml'
+        config_path.write_text("compound:\n  cid: 969516\n")
+        load_config(str(config_path))
+        
+        # Size change
+        config_path.write_text("compound:\n  cid: 2244\n")
+        assert load_config(str(config_path)) == {'compound': {'cid': 2244}}
+        
+        # Same size, different mtime
+        stat = config_path.stat()
+        config_path.write_text("compound:\n  cid: 3672\n")
+        os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert config_path.stat().st_size == stat.st_size
+        assert load_config(str(config_path)) == {'compound': {'cid': 3672}}
+    
+    def test_non_json_config_not_cached(self, tmp_path):
+        """Test configs with values JSON cannot hold (dates) skip the sidecar."""
+        import datetime
+        
+        config_path = tmp_path / 'config.yaml'
+        config_path.write_text("run_date: 2024-01-31\n")
+        
+        assert load_config(str(config_path)) == {'run_date': datetime.date(2024, 1, 31)}
+        assert not (tmp_path / 'config.yaml.cache.json').exists()
+    
+    def test_large_config(self, tmp_path):
+        """Test configs above the memory-map threshold load correctly."""
+        config_path = tmp_path / 'config.yaml'
+        genes = [f"GENE{i}" for i in range(10000)]
+        config_path.write_text("genes:\n" + "".join(f"  - {g}\n" for g in genes))
+        assert config_path.stat().st_size >= 64 * 1024
+        
+        assert load_config(str(config_path)) == {'genes': genes}
 
 
 class TestAPIs:
@@ -75,6 +187,267 @@ class TestAPIs:
         """Test PubChem query with invalid CID."""
         with pytest.raises(Exception):
             query_pubchem(cid=999999999999)
+    
+    def test_query_pubchem_many_batches_cids(self, monkeypatch, pubchem_response):
+        """Test many CIDs are fetched in a single PubChem request."""
+        urls = []
+        
+        def fake_get(url, timeout=None):
+            urls.append(url)
+            cids = url.split('/cid/')[1].split('/')[0].split(',')
+            return pubchem_response({'CID': int(cid), 'MolecularFormula': 'X'} for cid in cids)
+        
+        monkeypatch.setattr(api_wrappers._SESSION, 'get', fake_get)
+        result = query_pubchem_many([969516, 2244, 5090, 2244])
+        
+        assert len(urls) == 1
+        assert sorted(result) == [2244, 5090, 969516]
+    
+    def test_query_pubchem_smiles_sent_as_form_data(self, monkeypatch, pubchem_response):
+        """Test SMILES with '#' and '/' reach PubChem intact, outside the URL."""
+        requests_sent = []
+        
+        def fake_post(url, data=None, timeout=None):
+            requests_sent.append((url, data))
+            return pubchem_response([{'CID': 1, 'IsomericSMILES': data['smiles']}])
+        
+        monkeypatch.setattr(api_wrappers._SESSION, 'post', fake_post)
+        smiles_list = ['CC#N', 'C/C=C/C']
+        results = [f.result() for f in query_pubchem_smiles_many(smiles_list)]
+        
+        assert [r['IsomericSMILES'] for r in results] == smiles_list
+        for url, data in requests_sent:
+            assert '/compound/smiles/property/' in url
+            assert data['smiles'] not in url
+        assert sorted(data['smiles'] for _, data in requests_sent) == sorted(smiles_list)
+    
+    def test_disk_cache_reuses_result(self, tmp_path, monkeypatch):
+        """Test cached calls skip the wrapped function, regardless of gene order."""
+        monkeypatch.setenv('NETPHARM_CACHE_DIR', str(tmp_path))
+        monkeypatch.delenv('NETPHARM_NO_CACHE', raising=False)
+        calls = []
+        
+        @_disk_cache('dummy')
+        def fetch(gene_list, species=9606):
+            calls.append(gene_list)
+            return {'genes': gene_list}
+        
+        assert fetch(['TP53', 'EGFR']) == {'genes': ['TP53', 'EGFR']}
+        assert fetch(['EGFR', 'TP53']) == {'genes': ['TP53', 'EGFR']}
+        assert len(calls) == 1
+        
+        fetch(['EGFR', 'TP53'], species=10090)
+        assert len(calls) == 2
+
+
+class TestCompoundRetriever:
+    """Test compound lookups without hitting PubChem."""
+    
+    def test_batch_matches_single_lookup(self, monkeypatch, pubchem_response):
+        """Test batched and single CID lookups build identical records."""
+        import pubchempy as pcp
+        
+        # Full record, as PubChemPy parses it for get_compound_info()
+        record = {
+            'id': {'id': {'cid': 702}},
+            'atoms': {'aid': [1, 2, 3, 4], 'element': [6, 6, 8, 7]},
+            'bonds': {'aid1': [1, 2, 2], 'aid2': [2, 3, 4], 'order': [1, 1, 1]},
+            'props': [
+                {'urn': {'label': 'SMILES', 'name': 'Connectivity'}, 'value': {'sval': 'CC(N)O'}},
+                {'urn': {'label': 'SMILES', 'name': 'Absolute'}, 'value': {'sval': 'C[C@H](N)O'}},
+                {'urn': {'label': 'Molecular Formula'}, 'value': {'sval': 'C2H7NO'}},
+                {'urn': {'label': 'Molecular Weight'}, 'value': {'sval': '61.08'}},
+                {'urn': {'label': 'IUPAC Name', 'name': 'Preferred'}, 'value': {'sval': '1-aminoethanol'}},
+            ],
+        }
+        # Same compound, as the PUG-REST property table used by the batch path
+        properties = {
+            'CID': 702,
+            'ConnectivitySMILES': 'CC(N)O',
+            'SMILES': 'C[C@H](N)O',
+            'MolecularFormula': 'C2H7NO',
+            'MolecularWeight': '61.08',
+            'IUPACName': '1-aminoethanol',
+        }
+        
+        monkeypatch.setattr(pcp.Compound, 'from_cid', classmethod(lambda cls, cid: cls(record)))
+        monkeypatch.setattr(
+            api_wrappers._SESSION, 'get',
+            lambda url, timeout=None: pubchem_response([dict(properties)]),
+        )
+        compound._compound_from_cid.cache_clear()
+        
+        retriever = CompoundRetriever(logging.getLogger('netpharm-test'))
+        try:
+            single = retriever.get_compound_info(cid=702)
+        finally:
+            compound._compound_from_cid.cache_clear()
+        batch = retriever.get_compound_info_many([702])
+        
+        assert batch == {702: single}
+    
+    def test_smiles_many_skips_invalid(self, monkeypatch, pubchem_response):
+        """Test invalid SMILES are skipped without stopping the batch."""
+        requested = []
+        
+        def fake_post(url, data=None, timeout=None):
+            requested.append(data['smiles'])
+            return pubchem_response([{'CID': 1, 'SMILES': data['smiles']}])
+        
+        monkeypatch.setattr(api_wrappers._SESSION, 'post', fake_post)
+        retriever = CompoundRetriever(logging.getLogger('netpharm-test'))
+        compounds = retriever.get_compound_info_smiles_many(['CCO', 'C$', None, 'CCN'])
+        
+        assert sorted(requested) == ['CCN', 'CCO']
+        assert sorted(compounds) == ['CCN', 'CCO']
+        assert compounds['CCN']['isomeric_smiles'] == 'CCN'
+    
+    def test_many_invalid_cid_exits(self):
+        """Test an invalid CID in a batch is logged and exits."""
+        retriever = CompoundRetriever(logging.getLogger('netpharm-test'))
+        with pytest.raises(SystemExit):
+            retriever.get_compound_info_many([702, -1])
+
+
+class TestTargetPredictor:
+    """Test target handling without the manual download step."""
+    
+    @staticmethod
+    def _predict(tmp_path, swiss, known=None, predicted=None):
+        """Run the manual workflow non-interactively on pre-downloaded files."""
+        swiss.to_csv(tmp_path / 'swiss_results.csv', index=False)
+        if known is not None:
+            known.to_csv(tmp_path / 'Targets.csv', index=False)
+        if predicted is not None:
+            predicted.to_csv(tmp_path / 'Targets (1).csv', index=False)
+        predictor = TargetPredictor(logging.getLogger('netpharm.tests'))
+        stats = predictor.predict_targets_manual(
+            'CCO', swiss_threshold=0.1, output_dir=str(tmp_path), interactive=False
+        )
+        return predictor, stats
+    
+    def test_swiss_common_name_expansion(self, tmp_path):
+        """Test one row per gene, keeping a NaN target for a blank 'Common name'."""
+        swiss = pd.DataFrame({
+            'Target': ['t1', 't2', 't3'],
+            'Common name': ['IKBKG IKBKB', ' ', 'TP53'],
+            'Probability': [0.9, 0.5, 0.7],
+        })
+        predictor, stats = self._predict(tmp_path, swiss, known=pd.DataFrame({'Target Name': ['EGFR']}))
+        
+        assert stats['swiss_count'] == 4
+        targets = predictor.swiss_targets['Target'].tolist()
+        assert targets[:2] == ['IKBKG', 'IKBKB'] and targets[3] == 'TP53'
+        assert pd.isna(targets[2])
+    
+    def test_superpred_merge(self, tmp_path):
+        """Test SuperPred dedup keeps the best row per target, sorted by probability."""
+        swiss = pd.DataFrame({'Target': ['t1'], 'Common name': ['TP53'], 'Probability': [0.9]})
+        known = pd.DataFrame({'Target Name': ['EGFR', None]})
+        predicted = pd.DataFrame({
+            'Target Name': ['GENE_C', 'EGFR', 'GENE_C', None, 'GENE_D'],
+            'Probability': ['60%', '90%', '80%', '70%', '95%'],
+        })
+        predictor, stats = self._predict(tmp_path, swiss, known, predicted)
+        superpred = predictor.superpred_targets
+        
+        # Known EGFR beats its prediction; GENE_C keeps its 80% row; the
+        # NaN target appears once (the known row)
+        assert stats['superpred_count'] == 4
+        assert superpred['Probability'].tolist() == [1.0, 1.0, 0.95, 0.8]
+        assert superpred['Target'].tolist()[0] == 'EGFR'
+        assert pd.isna(superpred['Target'].tolist()[1])
+        assert superpred['Target'].tolist()[2:] == ['GENE_D', 'GENE_C']
+        assert superpred['Source'].tolist() == ['Known', 'Known', 'Predicted', 'Predicted']
+    
+    def test_get_all_target_genes_cached(self):
+        """Test gene list is cached and invalidated on reassignment."""
+        predictor = TargetPredictor(logging.getLogger('netpharm.tests'))
+        predictor.swiss_targets = pd.DataFrame({'Target': ['GENE_A ', 'gene_b']})
+        predictor.superpred_targets = pd.DataFrame({'Target': ['GENE_A', None, ' ']})
+        
+        assert sorted(predictor.get_all_target_genes()) == ['GENE_A', 'GENE_B']
+        assert predictor._gene_index_cache is not None
+        
+        predictor.superpred_targets = pd.DataFrame({'Target': ['GENE_C']})
+        assert predictor._gene_index_cache is None
+        assert sorted(predictor.get_all_target_genes()) == ['GENE_A', 'GENE_B', 'GENE_C']
+
+
+class TestNetworkAnalyzer:
+    """Test network construction and metrics without hitting STRING."""
+    
+    def test_igraph_centralities_match_networkx(self):
+        """Test the igraph centralities equal NetworkX on a disconnected graph."""
+        pytest.importorskip('igraph')
+        import networkx as nx
+        from netpharm.network import _path_centralities
+        
+        G = nx.Graph()
+        G.add_edges_from([('A', 'B'), ('B', 'C'), ('C', 'D'), ('B', 'E')])  # Tree
+        G.add_edges_from([('F', 'G'), ('G', 'H'), ('H', 'F')])  # Triangle
+        G.add_edge('I', 'J')  # Pair
+        G.add_node('K')  # Isolated
+        
+        betweenness, closeness = _path_centralities(G)
+        
+        assert betweenness == pytest.approx(nx.betweenness_centrality(G))
+        assert closeness == pytest.approx(nx.closeness_centrality(G))
+    
+    def test_blank_partner_name(self, monkeypatch):
+        """Test interactions with a blank or missing partner name are kept."""
+        from netpharm.network import NetworkAnalyzer
+        
+        tsv = (
+            "stringId_A\tstringId_B\tpreferredName_A\tpreferredName_B\tncbiTaxonId\tscore\n"
+            "9606.E1\t9606.E2\tTP53\tEGFR\t9606\t0.9\n"
+            "9606.E1\t9606.E3\tTP53\t\t9606\t0.8\n"
+            "9606.E2\t9606.E4\tEGFR\tNA\t9606\t0.75\n"
+        )
+        monkeypatch.setattr(api_wrappers, 'query_string_text', lambda *args, **kwargs: tsv)
+        
+        analyzer = NetworkAnalyzer(logging.getLogger('netpharm-test'))
+        interactions = analyzer.query_string_network(['TP53', 'EGFR'])
+        
+        assert list(interactions['preferredName_B']) == ['EGFR', '', 'NA']
+        assert list(interactions['score']) == [0.9, 0.8, 0.75]
+        assert analyzer.build_network().number_of_edges() == 3
+
+
+class TestNetworkVisualizer:
+    """Test skipping of up-to-date network plots."""
+    
+    @staticmethod
+    def _render(tmp_path, G, caplog, **kwargs):
+        """Plot the hub network and return True if it was (re)drawn."""
+        pytest.importorskip('matplotlib')
+        logger = logging.getLogger('netpharm-test')
+        visualizer = NetworkVisualizer(str(tmp_path), logger=logger, dpi=kwargs.pop('dpi', 20), **kwargs)
+        caplog.clear()
+        with caplog.at_level(logging.INFO, logger='netpharm-test'):
+            visualizer.create_all_visualizations(G, hub_nodes=['A', 'B'])
+        return 'Saved network visualization' in caplog.text
+    
+    def test_render_skip(self, tmp_path, caplog):
+        """Test unchanged inputs are skipped and any change re-renders."""
+        import networkx as nx
+        
+        G = nx.Graph()
+        G.add_weighted_edges_from([
+            ('A', 'B', 0.9), ('A', 'C', 0.8), ('B', 'C', 0.7), ('B', 'D', 0.95),
+        ])
+        
+        assert self._render(tmp_path, G, caplog)
+        assert not self._render(tmp_path, G, caplog)
+        
+        # The same graph object, mutated in place
+        G.add_edge('A', 'D', weight=0.75)
+        assert self._render(tmp_path, G, caplog)
+        assert not self._render(tmp_path, G, caplog)
+        
+        assert self._render(tmp_path, G, caplog, dpi=30)
+        assert self._render(tmp_path, G, caplog, dpi=30, output_format='svg')
+        assert os.path.exists(tmp_path / 'network_static_hubs_connectors.svg')
 
 
 def test_imports():